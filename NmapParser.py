@@ -2,6 +2,7 @@ import json
 import xml.etree.ElementTree as ET
 from Node import Node
 from Edge import Edge
+from TraceFusion import TraceFusion
 
 
 class NmapParser:
@@ -21,11 +22,13 @@ class NmapParser:
             - edges (List[Edge]): 存储解析出的 Edge 对象。
             - added_nodes (set[int]): 存储已添加的 Node 对象的哈希值，用于去重。
             - added_edges (set[int]): 存储已添加的 Edge 对象的哈希值，用于去重。
+            - fusion (TraceFusion): 记录所有 traceroute 跳数序列，用于合并缺失跳的占位节点。
         """
         self.nodes: list[Node] = []  # 存储 Node 实例的列表
         self.edges: list[Edge] = []  # 存储 Edge 实例的列表
         self.added_nodes: set[int] = set()  # 跟踪已添加的 Node，避免重复
         self.added_edges: set[int] = set()  # 跟踪已添加的 Edge，避免重复
+        self.fusion = TraceFusion()  # 多视点 traceroute 融合器
 
     def parse(self, file_path: str, localhost_node: Node) -> None:
         """
@@ -42,9 +45,7 @@ class NmapParser:
             root = tree.getroot()
 
             # 动态更新或添加 localhost 节点
-            if hash(localhost_node) not in self.added_nodes:
-                self.nodes.append(localhost_node)
-                self.added_nodes.add(hash(localhost_node))
+            self._add_localhost(localhost_node)
 
             # 遍历主机信息
             for host in root.findall("host"):
@@ -55,6 +56,35 @@ class NmapParser:
         except FileNotFoundError:
             print(f"文件未找到: {file_path}")
 
+    def parse_host(self, host: ET.Element, localhost_node: Node) -> None:
+        """
+        增量解析单个已完整写入的 <host> 元素，用于实时跟踪尚未结束的扫描输出。
+
+        :param host: ET.Element
+            XML 主机节点。
+        :param localhost_node: Node
+            表示 localhost 的 Node 实例。
+        """
+        self._add_localhost(localhost_node)
+        self._parse_host(host, localhost_node)
+
+    def fuse_missing_hops(self) -> int:
+        """
+        对齐所有已解析的 traceroute，将推断为同一路由器的缺失跳占位节点合并为一个节点。
+
+        可以在解析多个文件后调用，也可以在增量解析过程中重复调用。
+
+        :return: int
+            本次合并消除的占位节点数量。
+        """
+        before = {node for edge in self.edges for node in (edge.from_node, edge.to_node)}
+        self.edges = self.fusion.apply(self.edges)
+        self.added_edges = {hash(edge) for edge in self.edges}
+        after = {node for edge in self.edges for node in (edge.from_node, edge.to_node)}
+        eliminated = len(before) - len(after)
+        print(f"合并缺失跳占位节点 {eliminated} 个（累计 {self.fusion.eliminated} 个）")
+        return eliminated
+
     def save_to_json(self, output_file: str) -> None:
         """
         将节点和边数据保存为 JSON 文件。
@@ -76,6 +106,17 @@ class NmapParser:
         except IOError as e:
             print(f"保存 JSON 文件失败: {e}")
 
+    def _add_localhost(self, localhost_node: Node) -> None:
+        """
+        添加 localhost 节点（如果尚未添加）。
+
+        :param localhost_node: Node
+            表示 localhost 的 Node 实例。
+        """
+        if hash(localhost_node) not in self.added_nodes:
+            self.nodes.append(localhost_node)
+            self.added_nodes.add(hash(localhost_node))
+
     def _parse_host(self, host: ET.Element, localhost_node: Node) -> None:
         """
         解析单个主机信息。
@@ -183,6 +224,7 @@ class NmapParser:
             prev_hop = localhost_node.node_id
             prev_ttl = 0
             last_hop_ip = None
+            path = [(0, prev_hop, True)]  # 跳数序列 (ttl, 节点 ID, 是否响应)，供融合器对齐
 
             for hop in trace.findall("hop"):
                 hop_ip = hop.get("ipaddr")
@@ -205,6 +247,7 @@ class NmapParser:
 
                     prev_hop = missing_hop_ip
                     prev_ttl = missing_ttl
+                    path.append((missing_ttl, missing_hop_ip, False))
 
                 # 处理正常跳数
                 if hop_ip:
@@ -222,6 +265,7 @@ class NmapParser:
                     prev_hop = hop_ip
                     prev_ttl = hop_ttl
                     last_hop_ip = hop_ip
+                    path.append((hop_ttl, hop_ip, True))
 
             # 如果最后一跳不是目标主机，创建虚拟边
             if last_hop_ip != target_ip:
@@ -235,3 +279,6 @@ class NmapParser:
                 if hash(edge) not in self.added_edges:
                     self.edges.append(edge)
                     self.added_edges.add(hash(edge))
+                path.append((None, target_ip, True))
+
+            self.fusion.add_trace(localhost_node.node_id, target_ip, path)
@@ -0,0 +1,219 @@
+import argparse
+import os
+import time
+import xml.etree.ElementTree as ET
+from typing import List, Optional
+
+from Node import Node
+from NmapParser import NmapParser
+
+
+class _TailedFile:
+    """
+    单个被跟踪的 Nmap XML 文件的读取状态。
+
+    属性:
+        - file_path (str): XML 文件路径。
+        - localhost_node (Node): 发起该扫描的 localhost 节点。
+        - offset (int): 已读取的字节数，下次从此处继续读取。
+        - complete (bool): 是否已读到 </nmaprun>（或文件已损坏，不再跟踪）。
+    """
+
+    def __init__(self, file_path: str, localhost_node: Node):
+        """
+        初始化跟踪状态。
+
+        :param file_path: str
+            XML 文件路径。
+        :param localhost_node: Node
+            发起该扫描的 localhost 节点。
+        """
+        self.file_path = file_path
+        self.localhost_node = localhost_node
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        重置读取状态，从文件开头重新解析（用于文件被截断或重新生成的情况）。
+        """
+        self.offset = 0
+        self.complete = False
+        self.pull_parser = ET.XMLPullParser(events=("start", "end"))
+        self.root: Optional[ET.Element] = None
+        self.depth = 0
+
+
+class NmapTailer:
+    """
+    Nmap XML 实时跟踪器。
+
+    Nmap 在长时间扫描（如 -T2 -A --traceroute）过程中会逐步写入 -oX 文件，
+    此时 <nmaprun> 根元素尚未闭合，无法直接使用 NmapParser.parse。
+    该类像 tail -f 一样跟踪一个或多个 XML 文件，每次只读取新增的字节，
+    并在每个 <host> 元素完整写入后立即解析，增量更新节点、边以及导出的 JSON。
+
+    方法:
+        - add_file(): 添加一个需要跟踪的 XML 文件。
+        - poll(): 读取所有文件的新增内容，返回本次新解析的主机数量。
+        - watch(): 循环调用 poll()，直到所有扫描结束或长时间无新数据。
+    """
+
+    def __init__(self, parser: NmapParser, output_file: Optional[str] = None, fuse: bool = True):
+        """
+        初始化 NmapTailer。
+
+        :param parser: NmapParser
+            用于解析主机并保存节点和边的解析器实例。
+        :param output_file: Optional[str]
+            输出 JSON 文件路径；为 None 时不导出。
+        :param fuse: bool
+            导出前是否合并缺失跳的占位节点。
+        """
+        self.parser = parser
+        self.output_file = output_file
+        self.fuse = fuse
+        self.files: List[_TailedFile] = []
+
+    def add_file(self, file_path: str, localhost_node: Node) -> None:
+        """
+        添加一个需要跟踪的 XML 文件，文件可以尚未创建。
+
+        :param file_path: str
+            Nmap XML 文件路径。
+        :param localhost_node: Node
+            表示 localhost 的 Node 实例。
+        """
+        self.files.append(_TailedFile(file_path, localhost_node))
+
+    def poll(self) -> int:
+        """
+        读取所有未结束文件的新增内容，解析其中已完整写入的 <host> 元素。
+
+        如果有新主机被解析且设置了输出文件，则更新导出的 JSON。
+
+        :return: int
+            本次新解析的主机数量。
+        """
+        parsed = 0
+        for tailed in self.files:
+            if not tailed.complete:
+                parsed += self._poll_file(tailed)
+
+        if parsed and self.output_file:
+            if self.fuse:
+                self.parser.fuse_missing_hops()
+            self.parser.save_to_json(self.output_file)
+        return parsed
+
+    def watch(self, interval: float = 5.0, idle_timeout: Optional[float] = None) -> None:
+        """
+        持续跟踪所有文件，直到全部扫描结束，或超过 idle_timeout 秒没有新主机。
+
+        :param interval: float
+            两次读取之间的间隔秒数。
+        :param idle_timeout: Optional[float]
+            无新主机时的最长等待秒数；为 None 时一直等待到扫描结束。
+        """
+        last_update = time.monotonic()
+        while True:
+            if self.poll():
+                last_update = time.monotonic()
+            if all(tailed.complete for tailed in self.files):
+                break
+            if idle_timeout is not None and time.monotonic() - last_update > idle_timeout:
+                print(f"超过 {idle_timeout} 秒没有新的主机，停止跟踪")
+                break
+            time.sleep(interval)
+
+    def _poll_file(self, tailed: _TailedFile) -> int:
+        """
+        读取单个文件自上次以来新增的字节并交给增量 XML 解析器。
+
+        :param tailed: _TailedFile
+            文件的跟踪状态。
+        :return: int
+            本次从该文件新解析的主机数量。
+        """
+        try:
+            size = os.path.getsize(tailed.file_path)
+            if size < tailed.offset:
+                print(f"文件被截断，重新解析: {tailed.file_path}")
+                tailed.reset()
+            if size == tailed.offset:
+                return 0
+
+            with open(tailed.file_path, "rb") as f:
+                f.seek(tailed.offset)
+                data = f.read(size - tailed.offset)
+            tailed.offset += len(data)
+
+            tailed.pull_parser.feed(data)
+            return self._drain_events(tailed)
+
+        except FileNotFoundError:
+            return 0  # 扫描尚未开始写入文件
+        except ET.ParseError as e:
+            print(f"XML 解析错误: {tailed.file_path}: {e}")
+            tailed.complete = True
+            return 0
+
+    def _drain_events(self, tailed: _TailedFile) -> int:
+        """
+        处理增量解析器产生的事件，解析完整的 <host> 元素并释放已处理的元素。
+
+        :param tailed: _TailedFile
+            文件的跟踪状态。
+        :return: int
+            解析的主机数量。
+        """
+        parsed = 0
+        for event, element in tailed.pull_parser.read_events():
+            if event == "start":
+                if tailed.root is None:
+                    tailed.root = element
+                tailed.depth += 1
+                continue
+
+            tailed.depth -= 1
+            if tailed.depth == 0:
+                tailed.complete = True  # </nmaprun> 已写入，扫描结束
+            elif tailed.depth == 1:
+                # <nmaprun> 的直接子元素已完整写入
+                if element.tag == "host":
+                    self.parser.parse_host(element, tailed.localhost_node)
+                    parsed += 1
+                tailed.root.remove(element)
+        return parsed
+
+
+def main():
+    """
+    命令行入口，跟踪一个或多个正在写入的 Nmap XML 文件并持续导出 JSON。
+    """
+    arg_parser = argparse.ArgumentParser(description="实时跟踪正在写入的 Nmap XML 输出")
+    arg_parser.add_argument("-f", "--file", nargs=2, action="append", required=True,
+                            metavar=("XML", "SOURCE_IP"), help="XML 文件路径及发起扫描的机器 IP，可重复指定")
+    arg_parser.add_argument("-o", "--output", default="output.json", help="输出 JSON 文件路径")
+    arg_parser.add_argument("-i", "--interval", type=float, default=5.0, help="读取间隔秒数")
+    arg_parser.add_argument("--idle-timeout", type=float, default=None, help="无新主机时的最长等待秒数")
+    args = arg_parser.parse_args()
+
+    tailer = NmapTailer(NmapParser(), output_file=args.output)
+    for file_path, source_ip in args.file:
+        tailer.add_file(file_path, Node(
+            node_id=source_ip,
+            node_type="device",
+            state="up",
+            fqdn="unknown.local",
+            reverse_dns="unknown.local",
+            mac_address="00:00:00:00:00:00",
+            vendor="Unknown",
+            open_ports=[],
+            os="Unknown"
+        ))
+
+    tailer.watch(interval=args.interval, idle_timeout=args.idle_timeout)
+
+
+if __name__ == "__main__":
+    main()
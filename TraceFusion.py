@@ -0,0 +1,214 @@
+import ipaddress
+from typing import Dict, List, Optional, Tuple
+
+from Edge import Edge
+
+
+class TraceFusion:
+    """
+    多视点 traceroute 融合器。
+
+    NmapParser 会为每个缺失的跳数生成占位节点（pre-<ip>-missing-ttl-<n>），
+    同一台不响应的路由器在不同主机、不同扫描和不同视点下会变成多个互不相同的占位节点。
+    该类记录所有观测到的跳数序列，并通过哈希索引（而非两两比较）对齐不同的 traceroute，
+    推断哪些占位节点对应同一台路由器，将它们合并为一个节点。
+
+    对齐使用的索引键:
+        - route: (源节点, 目标网段, TTL)，同一视点到同一网段的同一跳视为同一路由器。
+        - converge: (前一个响应跳, 距离, 目标网段)，不同视点经过同一路由器后去往同一网段。
+        - segment: (前一个响应跳, 距离, 后一个响应跳, 距离)，夹在同一对响应跳之间的同一位置。
+
+    属性:
+        - prefix_len (int): 目标网段的 IPv4 前缀长度。
+        - prefix_len_v6 (int): 目标网段的 IPv6 前缀长度。
+        - placeholders (Dict[str, int]): 占位节点 ID 到内部编号的映射（按首次出现顺序）。
+        - trace_count (int): 已记录的 traceroute 数量。
+
+    方法:
+        - add_trace(): 记录一条 traceroute 的跳数序列。
+        - fuse(): 计算占位节点到合并后节点的映射。
+        - apply(): 将映射应用到边列表并去重。
+    """
+
+    def __init__(self, prefix_len: int = 24, prefix_len_v6: int = 64):
+        """
+        初始化 TraceFusion。
+
+        :param prefix_len: int
+            目标网段的 IPv4 前缀长度，默认为 24。
+        :param prefix_len_v6: int
+            目标网段的 IPv6 前缀长度，默认为 64。
+        """
+        self.prefix_len = prefix_len
+        self.prefix_len_v6 = prefix_len_v6
+        self.placeholders: Dict[str, int] = {}  # 占位节点 ID -> 内部编号
+        self.trace_count = 0
+        self._names: List[str] = []  # 内部编号 -> 占位节点 ID
+        self._parent: List[int] = []  # 并查集父节点
+        self._index: Dict[tuple, int] = {}  # 对齐键 -> 首个占位节点编号
+
+    def add_trace(self, source: str, target: str, path: List[Tuple[Optional[int], str, bool]]) -> None:
+        """
+        记录一条 traceroute，并立即把其中的占位节点登记到哈希索引中。
+
+        :param source: str
+            发起扫描的源节点 ID（视点）。
+        :param target: str
+            目标主机 IP。
+        :param path: List[Tuple[Optional[int], str, bool]]
+            按顺序排列的跳数序列，每项为 (ttl, 节点 ID, 是否响应)。
+            第一项通常为 (0, 源节点, True)；TTL 未知的跳（如补出的目标主机）为 None。
+        """
+        self.trace_count += 1
+        prefix = self._prefix(target)
+
+        for i, (ttl, node_id, responsive) in enumerate(path):
+            if responsive or ttl is None:
+                continue
+
+            pid = self._register(node_id)
+            prev_ip, prev_ttl = self._anchor(path, range(i - 1, -1, -1))
+            next_ip, next_ttl = self._anchor(path, range(i + 1, len(path)))
+
+            keys = [("route", source, prefix, ttl)]
+            if prev_ip is not None:
+                offset = ttl - prev_ttl
+                keys.append(("converge", prev_ip, offset, prefix))
+                if next_ip is not None:
+                    keys.append(("segment", prev_ip, offset, next_ip, next_ttl - ttl))
+
+            for key in keys:
+                other = self._index.setdefault(key, pid)
+                if other != pid:
+                    self._union(other, pid)
+
+    def fuse(self) -> Dict[str, str]:
+        """
+        计算占位节点到合并后节点的映射。
+
+        每组被推断为同一路由器的占位节点以最先出现的那个作为代表。
+
+        :return: Dict[str, str]
+            所有已登记占位节点 ID 到代表节点 ID 的映射。
+        """
+        return {name: self._names[self._find(pid)] for name, pid in self.placeholders.items()}
+
+    @property
+    def eliminated(self) -> int:
+        """
+        被合并消除的占位节点数量。
+
+        :return: int 已登记占位节点数减去合并后的组数。
+        """
+        roots = {self._find(pid) for pid in range(len(self._names))}
+        return len(self._names) - len(roots)
+
+    def apply(self, edges: List[Edge]) -> List[Edge]:
+        """
+        将合并映射应用到边列表，重写端点并去除重复边和自环。
+
+        :param edges: List[Edge]
+            原始边列表。
+        :return: List[Edge]
+            重写后的边列表，保持原有顺序。
+        """
+        mapping = self.fuse()
+        fused: List[Edge] = []
+        seen: set[int] = set()
+        for edge in edges:
+            from_node = mapping.get(edge.from_node, edge.from_node)
+            to_node = mapping.get(edge.to_node, edge.to_node)
+            if from_node == to_node:
+                continue
+            new_edge = Edge(
+                from_node=from_node,
+                to_node=to_node,
+                edge_type=edge.edge_type,
+                protocol=edge.protocol,
+                layer=edge.layer
+            )
+            if hash(new_edge) not in seen:
+                fused.append(new_edge)
+                seen.add(hash(new_edge))
+        return fused
+
+    def _prefix(self, target: str) -> str:
+        """
+        计算目标主机所在网段，无法解析的地址原样返回。
+
+        :param target: str
+            目标主机 IP。
+        :return: str 网段字符串，例如 "10.12.188.0/24"。
+        """
+        try:
+            address = ipaddress.ip_address(target)
+        except ValueError:
+            return target
+        prefix_len = self.prefix_len if address.version == 4 else self.prefix_len_v6
+        return str(ipaddress.ip_network(f"{target}/{prefix_len}", strict=False))
+
+    @staticmethod
+    def _anchor(path: List[Tuple[Optional[int], str, bool]], indices: range) -> Tuple[Optional[str], Optional[int]]:
+        """
+        沿给定方向查找最近的响应跳。
+
+        :param path: List[Tuple[Optional[int], str, bool]]
+            跳数序列。
+        :param indices: range
+            查找的下标顺序。
+        :return: Tuple[Optional[str], Optional[int]]
+            (节点 ID, TTL)，找不到或 TTL 未知时为 (None, None)。
+        """
+        for j in indices:
+            ttl, node_id, responsive = path[j]
+            if responsive:
+                return (node_id, ttl) if ttl is not None else (None, None)
+        return None, None
+
+    def _register(self, name: str) -> int:
+        """
+        登记占位节点并返回其内部编号。
+
+        :param name: str
+            占位节点 ID。
+        :return: int 内部编号。
+        """
+        pid = self.placeholders.get(name)
+        if pid is None:
+            pid = len(self._names)
+            self.placeholders[name] = pid
+            self._names.append(name)
+            self._parent.append(pid)
+        return pid
+
+    def _find(self, pid: int) -> int:
+        """
+        并查集查找（带路径压缩）。
+
+        :param pid: int
+            占位节点编号。
+        :return: int 所在组的代表编号。
+        """
+        root = pid
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[pid] != root:
+            self._parent[pid], pid = root, self._parent[pid]
+        return root
+
+    def _union(self, a: int, b: int) -> None:
+        """
+        合并两个占位节点所在的组，编号较小（较早出现）者作为代表。
+
+        :param a: int
+            占位节点编号。
+        :param b: int
+            占位节点编号。
+        """
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if root_a < root_b:
+            self._parent[root_b] = root_a
+        else:
+            self._parent[root_a] = root_b
@@ -5,7 +5,7 @@ from NmapParser import NmapParser
 
 def main():
     """
-    主函数，解析多个 Nmap XML 文件并保存为 JSON。
+    主函数，解析多个 Nmap XML 文件，合并缺失跳占位节点后保存为 JSON。
     """
     inputs = [
         ("./xml/222_20_126.xml", Node(
@@ -84,6 +84,9 @@ def main():
     for file_path, localhost_node in inputs:
         parser.parse(file_path, localhost_node)
 
+    # 对齐多个视点的 traceroute，合并缺失跳的占位节点
+    parser.fuse_missing_hops()
+
     # 保存为 JSON
     parser.save_to_json(output_file)
 